@@ -39,9 +39,9 @@ class CaptorDataHandler(SAXHandlerIntf):
     def on_literal(self, _kind: LiteralTokenKind, text: str):
         print(f"Skip unexpected literal '{text}' at position {str(self._pos)}")
 
-    def on_number(self, kind: NumericTokenKind, text: str):
+    def on_number(self, kind: NumericTokenKind, text: str, value = None):
         if kind != NumericTokenKind.NT_UNKNOWN:
-            self._data[self._member] = float(text)
+            self._data[self._member] = float(text) if value is None else float(value)
         else:
             print(f"Skip unexpected numeric value '{text}' at position {str(self._pos)}")
 
@@ -12,7 +12,10 @@ Python port of my C++ parsers (https://github.com/arbinada-com/stdext)
 """
 
 import io
+import re
 import enum
+import inspect
+import typing
 
 UTF16_MAX_CHAR = 0x10FFFF
 UTF16_BOMS     = {0xFFFE, 0xFEFF}
@@ -35,7 +38,10 @@ class Token(enum.IntEnum):
 
     @staticmethod
     def is_literal_token(tok) -> bool:
-        return tok in [Token.LITERAL_FALSE, Token.LITERAL_NULL, Token.LITERAL_TRUE]
+        return tok in _LITERAL_TOKENS
+
+_LITERAL_TOKENS = frozenset((Token.LITERAL_FALSE, Token.LITERAL_NULL, Token.LITERAL_TRUE))
+_NUMBER_TOKENS  = frozenset((Token.NUMBER_DECIMAL, Token.NUMBER_FLOAT, Token.NUMBER_INT))
 
 class LiteralTokenKind(enum.IntEnum):
     LT_UNKNOWN = 0,
@@ -51,6 +57,8 @@ class NumericTokenKind(enum.IntEnum):
 
 
 class TextPos:
+    __slots__ = ("line", "col")
+
     def __init__(self, line: int = 1, col: int = 0) -> None:
         self.line = line
         self.col = col
@@ -58,6 +66,9 @@ class TextPos:
     def __str__(self) -> str:
         return f"Line: {self.line}, col: {self.col}"
 
+    def __repr__(self) -> str:
+        return f"TextPos({self.line}, {self.col})"
+
     def __eq__(self, other) -> bool:
         return self.line == other.line and self.col == other.col
 
@@ -79,24 +90,24 @@ class JSONParserMessage:
     ERR_UNEXPECTED_CHAR_FMT            = 1060
     ERR_UNRECOGNIZED_ESCAPE_SEQ_FMT    = 1070
     # Parser messages
-    ERR_EXPECTED_ARRAY                 = 2100,
-    ERR_EXPECTED_ARRAY_ITEM            = 2105,
-    ERR_EXPECTED_EOF                   = 2107,
-    ERR_EXPECTED_LITERAL               = 2110,
-    ERR_EXPECTED_MEMBER_NAME           = 2112,
-    ERR_EXPECTED_NAME_SEPARATOR        = 2014,
-    ERR_EXPECTED_NUMBER                = 2116,
-    ERR_EXPECTED_OBJECT                = 2120,
-    ERR_EXPECTED_STRING                = 2125,
-    ERR_EXPECTED_VALUE                 = 2150,
-    ERR_EXPECTED_VALUE_BUT_FOUND_FMT   = 2155,
-    ERR_MEMBER_NAME_DUPLICATE_FMT      = 2200,
-    ERR_MEMBER_NAME_IS_EMPTY           = 2205,
-    ERR_PARENT_IS_NOT_CONTAINER        = 2250,
-    ERR_UNCLOSED_ARRAY                 = 2290,
-    ERR_UNCLOSED_OBJECT                = 2295,
-    ERR_UNEXPECTED_LEXEME_FMT          = 2300,
-    ERR_UNEXPECTED_TEXT_END            = 2310,
+    ERR_EXPECTED_ARRAY                 = 2100
+    ERR_EXPECTED_ARRAY_ITEM            = 2105
+    ERR_EXPECTED_EOF                   = 2107
+    ERR_EXPECTED_LITERAL               = 2110
+    ERR_EXPECTED_MEMBER_NAME           = 2112
+    ERR_EXPECTED_NAME_SEPARATOR        = 2014
+    ERR_EXPECTED_NUMBER                = 2116
+    ERR_EXPECTED_OBJECT                = 2120
+    ERR_EXPECTED_STRING                = 2125
+    ERR_EXPECTED_VALUE                 = 2150
+    ERR_EXPECTED_VALUE_BUT_FOUND_FMT   = 2155
+    ERR_MEMBER_NAME_DUPLICATE_FMT      = 2200
+    ERR_MEMBER_NAME_IS_EMPTY           = 2205
+    ERR_PARENT_IS_NOT_CONTAINER        = 2250
+    ERR_UNCLOSED_ARRAY                 = 2290
+    ERR_UNCLOSED_OBJECT                = 2295
+    ERR_UNEXPECTED_LEXEME_FMT          = 2300
+    ERR_UNEXPECTED_TEXT_END            = 2310
     ERR_UNSUPPORTED_DOM_VALUE_TYPE_FMT = 2400
 
 
@@ -119,15 +130,15 @@ class JSONParserMessage:
         ERR_EXPECTED_OBJECT               : "Object expected",
         ERR_EXPECTED_STRING               : "String expected",
         ERR_EXPECTED_VALUE                : "Expected value",
-        ERR_EXPECTED_VALUE_BUT_FOUND_FMT  : "Expected value but '%ls' found",
-        ERR_MEMBER_NAME_DUPLICATE_FMT     : "Duplicate member name '%ls'",
+        ERR_EXPECTED_VALUE_BUT_FOUND_FMT  : "Expected value but '{}' found",
+        ERR_MEMBER_NAME_DUPLICATE_FMT     : "Duplicate member name '{}'",
         ERR_MEMBER_NAME_IS_EMPTY          : "Member name is empty",
         ERR_PARENT_IS_NOT_CONTAINER       : "Parent DOM value is not container",
         ERR_UNCLOSED_ARRAY                : "Unclosed array",
         ERR_UNCLOSED_OBJECT               : "Unclosed object",
-        ERR_UNEXPECTED_LEXEME_FMT         : "Unexpected '%ls'",
+        ERR_UNEXPECTED_LEXEME_FMT         : "Unexpected '{}'",
         ERR_UNEXPECTED_TEXT_END           : "Unexpected end of text",
-        ERR_UNSUPPORTED_DOM_VALUE_TYPE_FMT: "Unsupported DOM value type: %ls"
+        ERR_UNSUPPORTED_DOM_VALUE_TYPE_FMT: "Unsupported DOM value type: {}"
     }
 
     @staticmethod
@@ -135,7 +146,7 @@ class JSONParserMessage:
         msg = JSONParserMessage._MESSAGES.get(msg_id, None)
         if msg is None:
             return f"Unknown message ID: {msg_id}"
-        return msg.format(args)
+        return msg.format(*args)
 
 class JSONError(Exception):
     """
@@ -144,16 +155,17 @@ class JSONError(Exception):
 
 class JSONParserError(JSONError):
     def __init__(self, pos: TextPos, msg_id: int, *args) -> None:
+        # The message text is formatted only when requested
+        super().__init__(pos, msg_id, *args)
         self._pos = pos
         self._msg_id = msg_id
-        msg = JSONParserMessage.text(msg_id, args)
-        super().__init__(msg)
+        self._msg_args = args
 
     def __str__(self) -> str:
         result = ""
         if self._pos is not None:
             result += f"{str(self._pos)}. "
-        result += super().__str__()
+        result += JSONParserMessage.text(self._msg_id, *self._msg_args)
         return result
 
     @property
@@ -165,109 +177,100 @@ class JSONParserError(JSONError):
         return self._pos
 
 
+def _int_value(text: str) -> int:
+    """
+    Converts the integer text or returns None when it exceeds the int digits limit of Python,
+    the handler gets the text only then
+    """
+    try:
+        return int(text)
+    except ValueError:
+        return None
+
+
+class _TextLines:
+    """
+    Resolves the indexes of a text buffer to text positions on demand.
+    New lines are counted incrementally from the last resolved index
+    """
+    __slots__ = ("_buf", "_offset", "_start_line_offset", "_line", "_line_offset", "_line_idx")
+
+    def __init__(self, buf: str, offset: int = 0, line: int = 1, line_offset: int = 0) -> None:
+        self._buf = buf
+        self._offset = offset                   # Offset of the buffer start in the text
+        self._start_line_offset = line_offset   # Offset of the line the buffer starts with
+        self._line = line                       # Line number at the _line_idx buffer index
+        self._line_offset = line_offset         # Offset of the _line start in the text
+        self._line_idx = 0                      # Buffer index the new lines are counted up to
+
+    def pos(self, idx: int) -> TextPos:
+        if idx >= self._line_idx:
+            line_count = self._buf.count('\n', self._line_idx, idx)
+            if line_count > 0:
+                self._line += line_count
+                self._line_offset = self._offset + self._buf.rfind('\n', self._line_idx, idx) + 1
+            self._line_idx = idx
+            return TextPos(self._line, self._offset + idx - self._line_offset + 1)
+        # The index is before the counted lines: they are counted back to it
+        line_count = self._buf.count('\n', idx, self._line_idx)
+        if line_count > 0:
+            self._line -= line_count
+            nl_idx = self._buf.rfind('\n', 0, idx)
+            self._line_offset = self._start_line_offset if nl_idx < 0 else self._offset + nl_idx + 1
+        self._line_idx = idx
+        return TextPos(self._line, self._offset + idx - self._line_offset + 1)
+
+    def next_lines(self, buf: str) -> "_TextLines":
+        """
+        Lines of the next buffer
+        """
+        self.pos(len(self._buf))
+        return _TextLines(buf, self._offset + len(self._buf), self._line, self._line_offset)
+
+
 class Lexeme:
+    # Plain slots instead of properties: the fields are read for every lexeme
+    __slots__ = ("token", "text", "literal_kind", "numeric_kind", "value", "_pos", "_lines", "_idx")
+
     def __init__(self, pos: TextPos, tok: Token = Token.UNKNOWN, text: str = "", 
                  literal_kind: LiteralTokenKind = LiteralTokenKind.LT_UNKNOWN,
-                 numeric_kind: NumericTokenKind = NumericTokenKind.NT_UNKNOWN) -> None:
+                 numeric_kind: NumericTokenKind = NumericTokenKind.NT_UNKNOWN,
+                 value: typing.Union[int, float] = None,
+                 lines: _TextLines = None, idx: int = 0) -> None:
+        """
+        The lexer passes the buffer lines and index instead of the position
+        which is resolved on the first request only.
+        The value of a numeric lexeme is converted once by the lexer
+        """
         self._pos = pos
-        self._token = tok
-        self._text = text
-        self._literal_kind = literal_kind
-        self._numeric_kind = numeric_kind
+        self.token = tok
+        self.text = text
+        self.literal_kind = literal_kind
+        self.numeric_kind = numeric_kind
+        self.value = value
+        self._lines = lines
+        self._idx = idx
 
     @property
     def pos(self) -> TextPos:
+        if self._pos is None and self._lines is not None:
+            self._pos = self._lines.pos(self._idx)
+            self._lines = None
         return self._pos
 
-    @property
-    def text(self) -> str:
-        return self._text
-
-    @property
-    def token(self) -> Token:
-        return self._token
-
-    @property
-    def literal_kind(self) -> LiteralTokenKind:
-        return self._literal_kind
-    
-    @property
-    def numeric_kind(self) -> NumericTokenKind:
-        return self._numeric_kind
-
-
-class NumericParser:
-    EXP_CHARS = {'e', 'E'}
-
-    def __init__(self) -> None:
-        self._char_count = 0
-        self._digit_count = 0
-        self._type = NumericTokenKind.NT_UNKNOWN
-        self._accepting_type = NumericTokenKind.NT_INTEGER
-        self._value = ""
-
-    def accept(self, c: str):
-        self._char_count += 1
-        self._value += c
-
-    def read_string(self, s: str) -> bool:
-        for c in s:
-            if not self.read_char(c):
-                self._type = NumericTokenKind.NT_UNKNOWN
-                break
-        return self.is_valid_number()
-
-    def read_char(self, c: str) -> bool:
-        if c == '-':
-            if self._char_count == 0:
-                self.accept(c)
-        elif c == '+':
-            if self._accepting_type == NumericTokenKind.NT_FLOAT and self._char_count == 0:
-                self.accept(c)
-            else:
-                return False
-        elif c == '.':
-            if self._accepting_type == NumericTokenKind.NT_INTEGER and self._digit_count > 0:
-                self.accept(c)
-                self._accepting_type = NumericTokenKind.NT_DECIMAL
-                self._type = NumericTokenKind.NT_UNKNOWN
-            else:
-                return False
-        elif c.isdigit():
-            if self._accepting_type == NumericTokenKind.NT_INTEGER and self._digit_count == 1 and self._value == "0":
-                self._type = NumericTokenKind.NT_UNKNOWN
-                return False
-            self.accept(c)
-            self._digit_count += 1
-            self._type = self._accepting_type
-        elif c in NumericParser.EXP_CHARS:
-            if self._accepting_type == NumericTokenKind.NT_INTEGER or self._accepting_type == NumericTokenKind.NT_DECIMAL:
-                self.accept(c)
-                self._char_count = 0
-                self._digit_count = 0
-                self._type = NumericTokenKind.NT_UNKNOWN
-                self._accepting_type = NumericTokenKind.NT_FLOAT
-            else:
-                self._type = NumericTokenKind.NT_UNKNOWN
-                return False
-        else:
-            return False
-        return True
-
-    @property
-    def type(self) -> NumericTokenKind:
-        return self._type
-    
-    @property
-    def value(self) -> str:
-        return self._value
-
 
 class Lexer:
 
+    __slots__ = ("_reader", "_buf", "_buf_len", "_idx", "_eof", "_initial", "_c", "_c_accepted", "_curr_lexeme",
+                 "_lines")
+
+    READ_BUFFER_SIZE = 65536
     DEC_DIGITS       = {'0', '1', '2', '3', '4', '5', '6', '7', '8', '9'}
     DEC_DIGITS_S     = DEC_DIGITS.union({'-', "+"})
+    EXP_CHARS        = {'e', 'E'}
+    EXP_SIGNS        = {'-', '+'}
     HEX_DIGITS       = {'a', 'A', 'b', 'B', 'c', 'C', 'd', 'D', 'e', 'E', 'f', 'F'}
+    HEX_VALUES       = {c: int(c, base = 16) for c in DEC_DIGITS.union(HEX_DIGITS)}
     WHITESPACES      = {' ', '\t', '\r', '\n'}
     LITERAL_PREFIXES = {'f', 'n', 't'}
     STRUCTURALS = {
@@ -278,6 +281,19 @@ class Lexer:
         ':': Token.NAME_SEPARATOR,
         ',': Token.VALUE_SEPARATOR 
     }
+    DELIMITERS = WHITESPACES.union(STRUCTURALS)
+    LITERALS = {
+        'f': ("false", Token.LITERAL_FALSE, LiteralTokenKind.LT_FALSE),
+        'n': ("null", Token.LITERAL_NULL, LiteralTokenKind.LT_NULL),
+        't': ("true", Token.LITERAL_TRUE, LiteralTokenKind.LT_TRUE)
+    }
+    ESCAPED_STRING_RE = re.compile(r'([^"\\]*(?:\\(?:["\\/bfnrt]|u[0-9a-fA-F]{4})[^"\\]*)*)"')
+    ESCAPE_SEQ_RE = re.compile(r'\\(?:u([0-9a-fA-F]{4})|(.))')
+    WHITESPACES_RE = re.compile(r"[ \t\r\n]*")
+    NUMBER_RE = re.compile(r"-?(?:0|[1-9][0-9]*)(\.[0-9]+)?([eE][-+]?[0-9]+)?")
+    # Whitespaces and a lexeme: structural char, escape-free string, number or literal followed by a delimiter
+    LEXEME_RE = re.compile(r'[ \t\r\n]*(?:([\[\]{}:,])|(")([^"\\]*)"|'
+                           r'(-?(?:0|[1-9][0-9]*)(\.[0-9]+)?([eE][-+]?[0-9]+)?|true|false|null)[ \t\r\n\[\]{}:,])')
     ESCAPE_CHARS = {
         '"': '"',
         '\\': '\\',
@@ -289,18 +305,41 @@ class Lexer:
         't': '\t'
     }
 
-    def __init__(self, reader: io.TextIOBase) -> None:
-        self._reader = reader
+    def __init__(self, reader: typing.Union[io.TextIOBase, str, bytes]) -> None:
+        """
+        The reader is either a text stream read by chunks, or a whole text already loaded in memory.
+        In-memory bytes are decoded from UTF-8 once
+        """
+        self.reset(reader)
+
+    def reset(self, reader: typing.Union[io.TextIOBase, str, bytes]):
+        """
+        Restarts the lexer on a new reader, the instance may be reused for several texts
+        """
+        if isinstance(reader, (bytes, bytearray, memoryview)):
+            reader = str(reader, "utf-8")
+        if isinstance(reader, str):
+            self._reader = None
+            self._buf = reader
+        else:
+            self._reader = reader
+            self._buf = ""
+        self._buf_len = len(self._buf)
+        self._idx = 0
         self._eof = False
         self._initial = True
         self._c = ""
         self._c_accepted = False
         self._curr_lexeme = None
-        self._pos = TextPos()
+        # Text positions are computed on demand from the buffer indexes
+        self._lines = _TextLines(self._buf)
 
     @property
-    def pos(self) ->TextPos:
-        return self._pos
+    def pos(self) -> TextPos:
+        """
+        Position of the current char
+        """
+        return self._lines.pos(self._idx - 1)
 
     @staticmethod
     def is_digit(c: str) -> bool:
@@ -308,7 +347,7 @@ class Lexer:
 
     @staticmethod
     def is_hex_digit(c: str) -> bool:
-        return c.isdigit() or c in Lexer.HEX_DIGITS
+        return c in Lexer.HEX_VALUES
 
     @staticmethod
     def is_structural(c: str) -> bool:
@@ -319,136 +358,332 @@ class Lexer:
         return c in Lexer.WHITESPACES 
         # Two times faster than str.isspace()
 
+    @staticmethod
+    def decode_escape_seq(m: re.Match) -> str:
+        """
+        Decodes the escape sequence matched by ESCAPE_SEQ_RE
+        """
+        esc = m.group(2)
+        if esc is not None:
+            return Lexer.ESCAPE_CHARS[esc]
+        return Lexer.decode_hex_char(m.group(1), 0)
+
+    @staticmethod
+    def decode_hex_char(buf: str, idx: int) -> str:
+        """
+        Decodes four hex digits starting at the index, returns None if some are not hex digits
+        """
+        hex_values = Lexer.HEX_VALUES
+        code = 0
+        for c in buf[idx:idx + 4]:
+            digit = hex_values.get(c)
+            if digit is None:
+                return None
+            code = (code << 4) | digit
+        return chr(code)
+
     def handle_escaped_char(self, start: TextPos) -> str:
-        value = ""
+        hex_values = Lexer.HEX_VALUES
+        code = 0
         for _i in range(0, 4):
-            if not (self.next_char() and Lexer.is_hex_digit(self._c)):
+            if not self.next_char() or (digit := hex_values.get(self._c)) is None:
                 raise JSONParserError(start, JSONParserMessage.ERR_UNALLOWED_ESCAPE_SEQ)
-            value += self._c
+            code = (code << 4) | digit
             self._c_accepted = True
-        code = int(value, base = 16)
         return chr(code)
     
     def handle_literal(self) -> Lexeme:
-        pos = self._pos.make_copy()
-        value = self._c
-        self._c_accepted = True
-        while self.next_char():
-            if self.is_whitespace(self._c) or self.is_structural(self._c):
-                break
-            value += self._c
+        lines = self._lines
+        start_idx = self._idx - 1
+        # Fast path: the literal expected by its first char and a delimiter are buffered
+        value, tok, literal_kind = Lexer.LITERALS[self._c]
+        end = start_idx + len(value)
+        if end < self._buf_len and self._buf.startswith(value, start_idx) and self._buf[end] in Lexer.DELIMITERS:
+            self.skip_chars(end + 1)
+            self._c_accepted = False  # The delimiter is not a part of the literal
+            return Lexeme(None, tok, value, literal_kind, lines = lines, idx = start_idx)
+        parts = []
+        delimiters = Lexer.DELIMITERS
+        while self._c and self._c not in delimiters:
+            # The current char is the last one read from the buffer
+            start = self._idx - 1
+            end = self._idx
+            while end < self._buf_len and self._buf[end] not in delimiters:
+                end += 1
+            parts.append(self._buf[start:end])
+            if end > self._idx:
+                self.skip_chars(end)
             self._c_accepted = True
+            self.next_char()
+        value = "".join(parts)
         if value == "false":
-            return Lexeme(pos, Token.LITERAL_FALSE, value, literal_kind = LiteralTokenKind.LT_FALSE)
+            return Lexeme(None, Token.LITERAL_FALSE, value, LiteralTokenKind.LT_FALSE, lines = lines, idx = start_idx)
         elif value == "null":
-            return Lexeme(pos, Token.LITERAL_NULL, value, literal_kind = LiteralTokenKind.LT_NULL)
+            return Lexeme(None, Token.LITERAL_NULL, value, LiteralTokenKind.LT_NULL, lines = lines, idx = start_idx)
         elif value == "true":
-            return Lexeme(pos, Token.LITERAL_TRUE, value, literal_kind = LiteralTokenKind.LT_TRUE)
+            return Lexeme(None, Token.LITERAL_TRUE, value, LiteralTokenKind.LT_TRUE, lines = lines, idx = start_idx)
         else:
-            raise JSONParserError(pos, JSONParserMessage.ERR_INVALID_LITERAL_FMT, value)
+            raise JSONParserError(lines.pos(start_idx), JSONParserMessage.ERR_INVALID_LITERAL_FMT, value)
 
     def handle_number(self) -> Lexeme:
-        pos = self._pos.make_copy()
-        np = NumericParser()
-        accepting = True
-        while accepting:
-            if np.read_char(self._c):
-                self._c_accepted = True
-                accepting = self.next_char()
-            else:
-                break
-        tok = Token.UNKNOWN
-        numeric_kind = NumericTokenKind.NT_UNKNOWN
-        if np.type == NumericTokenKind.NT_DECIMAL:
+        lines = self._lines
+        start_idx = self._idx - 1
+        # Fast path: the number and a delimiter are buffered
+        m = Lexer.NUMBER_RE.match(self._buf, start_idx)
+        if m is not None:
+            end = m.end()
+            if end < self._buf_len and self._buf[end] in Lexer.DELIMITERS:
+                self.skip_chars(end + 1)
+                self._c_accepted = False  # The delimiter is not a part of the number
+                return Lexer.number_lexeme(m.group(), m.group(1), m.group(2), lines, start_idx)
+        parts = []
+        tok = Token.NUMBER_INT
+        numeric_kind = NumericTokenKind.NT_INTEGER
+        if self._c == '-':
+            self.accept_char(parts)
+        if self._c == '0':
+            self.accept_char(parts)
+        else:
+            self.accept_digits(parts)
+        if self._c == '.':
             tok = Token.NUMBER_DECIMAL
             numeric_kind = NumericTokenKind.NT_DECIMAL
-        elif np.type == NumericTokenKind.NT_FLOAT:
+            self.accept_char(parts)
+            self.accept_digits(parts)
+        if self._c in Lexer.EXP_CHARS:
             tok = Token.NUMBER_FLOAT
             numeric_kind = NumericTokenKind.NT_FLOAT
-        elif np.type == NumericTokenKind.NT_INTEGER:
-            tok = Token.NUMBER_INT
-            numeric_kind = NumericTokenKind.NT_INTEGER
-        else:
-            raise JSONParserError(self._pos, JSONParserMessage.ERR_INVALID_NUMBER)
+            self.accept_char(parts)
+            if self._c in Lexer.EXP_SIGNS:
+                self.accept_char(parts)
+            self.accept_digits(parts)
         if self._c_accepted or self.is_whitespace(self._c) or self.is_structural(self._c):
-            return Lexeme(pos, tok, np.value, numeric_kind = numeric_kind)
+            text = "".join(parts)
+            value = _int_value(text) if tok == Token.NUMBER_INT else float(text)
+            return Lexeme(None, tok, text, numeric_kind = numeric_kind, value = value, lines = lines, idx = start_idx)
         else:
-            raise JSONParserError(self._pos, JSONParserMessage.ERR_INVALID_NUMBER)
+            raise JSONParserError(self.pos, JSONParserMessage.ERR_INVALID_NUMBER)
+
+    @staticmethod
+    def number_lexeme(text: str, fraction: str, exponent: str, lines: _TextLines, idx: int) -> Lexeme:
+        """
+        Makes the lexeme of the number matched by NUMBER_RE with its fraction and exponent groups
+        """
+        if exponent is not None:
+            return Lexeme(None, Token.NUMBER_FLOAT, text, numeric_kind = NumericTokenKind.NT_FLOAT,
+                          value = float(text), lines = lines, idx = idx)
+        elif fraction is not None:
+            return Lexeme(None, Token.NUMBER_DECIMAL, text, numeric_kind = NumericTokenKind.NT_DECIMAL,
+                          value = float(text), lines = lines, idx = idx)
+        return Lexeme(None, Token.NUMBER_INT, text, numeric_kind = NumericTokenKind.NT_INTEGER,
+                      value = _int_value(text), lines = lines, idx = idx)
+
+    def accept_char(self, parts: list):
+        parts.append(self._c)
+        self._c_accepted = True
+        self.next_char()
+
+    def accept_digits(self, parts: list):
+        """
+        Accepts one or more decimal digits starting from the current char
+        """
+        digits = Lexer.DEC_DIGITS
+        if self._c not in digits:
+            raise JSONParserError(self.pos, JSONParserMessage.ERR_INVALID_NUMBER)
+        while self._c in digits:
+            # The current char is the last one read from the buffer
+            start = self._idx - 1
+            end = self._idx
+            while end < self._buf_len and self._buf[end] in digits:
+                end += 1
+            parts.append(self._buf[start:end])
+            if end > self._idx:
+                self.skip_chars(end)
+            self._c_accepted = True
+            self.next_char()
 
     def handle_string(self) -> Lexeme:
-        start_pos = self._pos.make_copy()
-        value = ""
-        while self.next_char():
+        lines = self._lines
+        start_idx = self._idx - 1
+        # Fast path: the whole string is buffered and has no escapes
+        end = self._buf.find('"', self._idx)
+        if end >= 0 and self._buf.find('\\', self._idx, end) < 0:
+            value = self._buf[self._idx:end]
+            self.skip_chars(end + 1)
+            return Lexeme(None, Token.STRING, value, lines = lines, idx = start_idx)
+        # The whole string is buffered and all its escapes are valid: they are replaced in one pass
+        m = Lexer.ESCAPED_STRING_RE.match(self._buf, self._idx)
+        if m is not None:
+            value = Lexer.ESCAPE_SEQ_RE.sub(Lexer.decode_escape_seq, m.group(1))
+            self.skip_chars(m.end())
+            return Lexeme(None, Token.STRING, value, lines = lines, idx = start_idx)
+        parts = []
+        # The next quote index is searched again only after the cursor passed it or the buffer changed:
+        # an in-memory text is a single buffer which would be rescanned up to its end for each escape
+        quote_buf = self._buf
+        quote = end
+        while True:
+            if self._idx < self._buf_len:
+                # Bulk copy of the chars up to the next quote or escape
+                if quote_buf is not self._buf or 0 <= quote < self._idx:
+                    quote_buf = self._buf
+                    quote = self._buf.find('"', self._idx)
+                end = self._buf_len if quote < 0 else quote
+                esc = self._buf.find('\\', self._idx, end)
+                if esc >= 0:
+                    end = esc
+                if end > self._idx:
+                    parts.append(self._buf[self._idx:end])
+                    self.skip_chars(end)
+            if not self.next_char():
+                break
             if self._c == '"':
                 self._c_accepted = True
-                return Lexeme(start_pos, Token.STRING, value)
+                return Lexeme(None, Token.STRING, "".join(parts), lines = lines, idx = start_idx)
             elif self._c == '\\':
-                pos = self._pos.make_copy()
+                if self._idx < self._buf_len:
+                    # Escape in the buffer: no position needed, the chars are taken directly
+                    esc_char = Lexer.ESCAPE_CHARS.get(self._buf[self._idx])
+                    if esc_char is not None:
+                        parts.append(esc_char)
+                        self.skip_chars(self._idx + 1)
+                        continue
+                    if self._buf[self._idx] == 'u' and self._idx + 5 <= self._buf_len:
+                        esc_char = Lexer.decode_hex_char(self._buf, self._idx + 1)
+                        if esc_char is not None:
+                            parts.append(esc_char)
+                            self.skip_chars(self._idx + 5)
+                            continue
+                pos = self.pos
                 if not self.next_char():
                     raise JSONParserError(pos, JSONParserMessage.ERR_UNCLOSED_STRING)
                 if esc_char := Lexer.ESCAPE_CHARS.get(self._c):
-                    value += esc_char
+                    parts.append(esc_char)
                     self._c_accepted = True
                 elif self._c == 'u':
-                    value += self.handle_escaped_char(pos)
+                    parts.append(self.handle_escaped_char(pos))
                 else:
                     s = "\\" + self._c
                     raise JSONParserError(pos, JSONParserMessage.ERR_UNRECOGNIZED_ESCAPE_SEQ_FMT, s)
             else:
-                value += self._c
+                parts.append(self._c)
                 self._c_accepted = True
-        raise JSONParserError(self._pos, JSONParserMessage.ERR_UNCLOSED_STRING)
+        raise JSONParserError(self.pos, JSONParserMessage.ERR_UNCLOSED_STRING)
+
+    def skip_chars(self, end: int):
+        """
+        Accepts buffered chars up to the `end` index in the same way as
+        sequential next_char() calls do
+        """
+        self._c = self._buf[end - 1]
+        self._c_accepted = True
+        self._idx = end
+
+    def _read_buffer(self) -> bool:
+        if self._reader is None:
+            return False
+        buf = self._reader.read(self.READ_BUFFER_SIZE)
+        if not buf:
+            return False # The last buffer is kept to get the position at the end of text
+        self._lines = self._lines.next_lines(buf)
+        self._buf = buf
+        self._buf_len = len(buf)
+        self._idx = 0
+        return True
 
     def next_char(self) -> bool:
-        is_new_line = self._c == '\n'
-        self._c = self._reader.read(1)
-        self._eof = self._c == "" or self._c is None
-        if not self._eof:
-            self._c_accepted = False
-            if is_new_line: 
-                self._pos.newline()
-            self._pos.col += 1
-            return True
-        return False
+        if self._idx >= self._buf_len and not self._read_buffer():
+            self._c = ""
+            self._eof = True
+            return False
+        self._c = self._buf[self._idx]
+        self._idx += 1
+        self._c_accepted = False
+        return True
     
     def eof(self) -> bool:
         return self._eof
 
     def next_lexeme(self) -> Lexeme:
         if self._c_accepted or self._initial:
+            # Lexeme scan: the whitespaces and the next lexeme are matched in a single regex call
+            # when they are all in the buffer, so no char is read one by one
+            m = Lexer.LEXEME_RE.match(self._buf, self._idx)
+            if m is not None:
+                self._initial = False
+                self.skip_chars(m.end())
+                c = m.group(1)
+                if c is not None:
+                    return Lexeme(None, Lexer.STRUCTURALS[c], c, lines = self._lines, idx = self._idx - 1)
+                text = m.group(3)
+                if text is not None:
+                    return Lexeme(None, Token.STRING, text, lines = self._lines, idx = m.start(2))
+                # Numbers and literals are matched with the next delimiter which is not accepted yet
+                self._c_accepted = False
+                text = m.group(4)
+                start_idx = m.start(4)
+                if text[0] in Lexer.LITERALS:
+                    value, tok, literal_kind = Lexer.LITERALS[text[0]]
+                    return Lexeme(None, tok, value, literal_kind, lines = self._lines, idx = start_idx)
+                return Lexer.number_lexeme(text, m.group(5), m.group(6), self._lines, start_idx)
             if not self.next_char():
                 return None
         self._initial = False
         self.skip_whitespaces()
         if not self._c_accepted:
-            c = self._c
-            pos = self._pos.make_copy()
-            if c == '"':
-                return self.handle_string()
-            elif self._c in Lexer.DEC_DIGITS_S:
-                return self.handle_number()
-            elif tok := Lexer.STRUCTURALS.get(c):
-                self._c_accepted = True
-                return Lexeme(pos, tok, c)
-            elif c in Lexer.LITERAL_PREFIXES:
-                return self.handle_literal()
-            else:
-                raise JSONParserError(pos, JSONParserMessage.ERR_UNEXPECTED_CHAR_FMT, c)
+            # One table lookup selects the handler of the lexeme starting with the current char
+            handler = Lexer.LEXEME_HANDLERS.get(self._c)
+            if handler is None:
+                raise JSONParserError(self.pos, JSONParserMessage.ERR_UNEXPECTED_CHAR_FMT, self._c)
+            return handler(self)
         if self._eof:
             return None
         else:
-            raise JSONParserError(self._pos, JSONParserMessage.ERR_UNEXPECTED_CHAR_FMT, self._c)
+            raise JSONParserError(self.pos, JSONParserMessage.ERR_UNEXPECTED_CHAR_FMT, self._c)
+
+    def __iter__(self) -> typing.Iterator[Lexeme]:
+        """
+        Iterates the remaining lexemes up to the end of text
+        """
+        while (lex := self.next_lexeme()) is not None:
+            yield lex
+
+    def handle_structural(self) -> Lexeme:
+        self._c_accepted = True
+        return Lexeme(None, Lexer.STRUCTURALS[self._c], self._c, lines = self._lines, idx = self._idx - 1)
 
     def skip_whitespaces(self):
-        while self.is_whitespace(self._c):
+        whitespaces = Lexer.WHITESPACES
+        while self._c in whitespaces:
+            # Scan the rest of the buffered run in a single regex call unless it is a single char
+            end = self._idx
+            if end < self._buf_len and self._buf[end] in whitespaces:
+                end = Lexer.WHITESPACES_RE.match(self._buf, end).end()
+            if end > self._idx:
+                self.skip_chars(end)
             self._c_accepted = True
             self.next_char()
 
+    # Lexeme handlers by the first char
+    LEXEME_HANDLERS = {
+        '"': handle_string,
+        **dict.fromkeys(DEC_DIGITS_S, handle_number),
+        **dict.fromkeys(STRUCTURALS, handle_structural),
+        **dict.fromkeys(LITERAL_PREFIXES, handle_literal)
+    }
+
 
 class SAXHandlerIntf:
+    __slots__ = ()
+
     def on_literal(self, kind: LiteralTokenKind, text: str):
         raise NotImplemented()
-    def on_number(self, kind: NumericTokenKind, text: str):
+    def on_number(self, kind: NumericTokenKind, text: str, value: typing.Union[int, float] = None):
+        """
+        Optional value is the number already converted to int or float,
+        None for an integer exceeding the int digits limit of Python.
+        The parser passes it only if the handler accepts the third argument
+        """
         raise NotImplemented()
     def on_string(self, text: str):
         raise NotImplemented()
@@ -463,33 +698,138 @@ class SAXHandlerIntf:
     def on_end_array(self, element_count: int):
         raise NotImplemented()
     def textpos_changed(self, pos: TextPos):
-        raise NotImplemented()
+        """
+        Optional. The parser skips the call if the handler does not override it
+        """
+
+
+def _accepts_value(on_number) -> bool:
+    """
+    Checks whether the handler on_number() accepts the optional value argument
+    """
+    try:
+        inspect.signature(on_number).bind(NumericTokenKind.NT_INTEGER, "", None)
+    except TypeError:
+        return False
+    except ValueError:
+        pass  # No signature available
+    return True
+
+
+# Parser states
+_PS_DOC          = 0   # Top-level value
+_PS_ARRAY_FIRST  = 1   # First array item or array end
+_PS_ARRAY_ITEM   = 2   # Array item after a value separator
+_PS_ARRAY_NEXT   = 3   # Value separator or array end
+_PS_OBJECT_FIRST = 4   # First member name or object end
+_PS_OBJECT_NAME  = 5   # Member name after a value separator
+_PS_OBJECT_SEP   = 6   # Name separator
+_PS_OBJECT_VALUE = 7   # Member value
+_PS_OBJECT_NEXT  = 8   # Value separator or object end
+_PS_VALUE_END    = 9   # Pseudo state: resolved from the container stack once a value is complete
+
+# Parser actions
+_PA_NONE         = 0
+_PA_STRING       = 1
+_PA_NUMBER_INT   = 2
+_PA_NUMBER_FLOAT = 3
+_PA_LITERAL      = 4
+_PA_MEMBER_NAME  = 5
+_PA_BEGIN_ARRAY  = 6
+_PA_END_ARRAY    = 7
+_PA_BEGIN_OBJECT = 8
+_PA_END_OBJECT   = 9
+
+def _value_transitions() -> dict:
+    result = {
+        Token.BEGIN_ARRAY:  (_PA_BEGIN_ARRAY, _PS_ARRAY_FIRST),
+        Token.BEGIN_OBJECT: (_PA_BEGIN_OBJECT, _PS_OBJECT_FIRST),
+        Token.STRING:       (_PA_STRING, _PS_VALUE_END),
+        Token.NUMBER_INT:   (_PA_NUMBER_INT, _PS_VALUE_END)
+    }
+    for tok in _NUMBER_TOKENS - {Token.NUMBER_INT}:
+        result[tok] = (_PA_NUMBER_FLOAT, _PS_VALUE_END)
+    for tok in _LITERAL_TOKENS:
+        result[tok] = (_PA_LITERAL, _PS_VALUE_END)
+    return result
+
+# Pushdown automaton transitions: _PARSER_TRANSITIONS[state][token] = (action, next state)
+_PARSER_TRANSITIONS = (
+    _value_transitions(),                                             # _PS_DOC
+    {**_value_transitions(),
+     Token.END_ARRAY: (_PA_END_ARRAY, _PS_VALUE_END)},                # _PS_ARRAY_FIRST
+    _value_transitions(),                                             # _PS_ARRAY_ITEM
+    {Token.VALUE_SEPARATOR: (_PA_NONE, _PS_ARRAY_ITEM),
+     Token.END_ARRAY: (_PA_END_ARRAY, _PS_VALUE_END)},                # _PS_ARRAY_NEXT
+    {Token.STRING: (_PA_MEMBER_NAME, _PS_OBJECT_SEP),
+     Token.END_OBJECT: (_PA_END_OBJECT, _PS_VALUE_END)},              # _PS_OBJECT_FIRST
+    {Token.STRING: (_PA_MEMBER_NAME, _PS_OBJECT_SEP)},                # _PS_OBJECT_NAME
+    {Token.NAME_SEPARATOR: (_PA_NONE, _PS_OBJECT_VALUE)},             # _PS_OBJECT_SEP
+    _value_transitions(),                                             # _PS_OBJECT_VALUE
+    {Token.VALUE_SEPARATOR: (_PA_NONE, _PS_OBJECT_NAME),
+     Token.END_OBJECT: (_PA_END_OBJECT, _PS_VALUE_END)}               # _PS_OBJECT_NEXT
+)
+
+# Errors raised when the state has no transition for the lexeme: (on unexpected lexeme, on end of text)
+_PARSER_ERRORS = (
+    # _PS_DOC
+    (JSONParserMessage.ERR_EXPECTED_VALUE_BUT_FOUND_FMT, None),
+    # _PS_ARRAY_FIRST
+    (JSONParserMessage.ERR_EXPECTED_VALUE_BUT_FOUND_FMT, JSONParserMessage.ERR_UNCLOSED_ARRAY),
+    # _PS_ARRAY_ITEM
+    (JSONParserMessage.ERR_EXPECTED_VALUE_BUT_FOUND_FMT, JSONParserMessage.ERR_EXPECTED_ARRAY_ITEM),
+    # _PS_ARRAY_NEXT
+    (JSONParserMessage.ERR_UNCLOSED_ARRAY, JSONParserMessage.ERR_UNCLOSED_ARRAY),
+    # _PS_OBJECT_FIRST
+    (JSONParserMessage.ERR_EXPECTED_MEMBER_NAME, JSONParserMessage.ERR_UNCLOSED_OBJECT),
+    # _PS_OBJECT_NAME
+    (JSONParserMessage.ERR_EXPECTED_MEMBER_NAME, JSONParserMessage.ERR_EXPECTED_MEMBER_NAME),
+    # _PS_OBJECT_SEP
+    (JSONParserMessage.ERR_EXPECTED_NAME_SEPARATOR, JSONParserMessage.ERR_EXPECTED_NAME_SEPARATOR),
+    # _PS_OBJECT_VALUE
+    (JSONParserMessage.ERR_EXPECTED_VALUE_BUT_FOUND_FMT, JSONParserMessage.ERR_EXPECTED_VALUE),
+    # _PS_OBJECT_NEXT
+    (JSONParserMessage.ERR_UNCLOSED_OBJECT, JSONParserMessage.ERR_UNCLOSED_OBJECT)
+)
 
 
 class SAXParser:
     """
     JSON stream parser
     """
+    __slots__ = ("_reader", "_handler", "_lexer", "_curr",
+                 "_on_literal", "_on_number", "_on_string", "_on_begin_object", "_on_member_name",
+                 "_on_end_object", "_on_begin_array", "_on_end_array", "_textpos_changed")
 
-    def __init__(self, reader: io.TextIOBase, handler: SAXHandlerIntf) -> None:
+    def __init__(self, reader: typing.Union[io.TextIOBase, str, bytes], handler: SAXHandlerIntf) -> None:
         self._reader = reader
         self._handler = handler
+        self._bind_handler(handler)
+        self._textpos_changed = None
+        if type(handler).textpos_changed is not SAXHandlerIntf.textpos_changed:
+            self._textpos_changed = handler.textpos_changed
         self._lexer = Lexer(self._reader)
         self._curr = Lexeme(TextPos())
 
-    def _curr_token_is(self, tok: Token) -> bool:
-        return self._curr_token() == tok
-
-    def _curr_token_in(self, tokens: list) -> bool:
-        for tok in tokens:
-            if self._curr_token_is(tok):
-                return True
-        return False
+    def _bind_handler(self, handler: SAXHandlerIntf):
+        # Bound handler methods are resolved once instead of per event
+        self._on_literal = handler.on_literal
+        self._on_number = handler.on_number
+        if not _accepts_value(handler.on_number):
+            on_number = handler.on_number
+            self._on_number = lambda kind, text, value: on_number(kind, text)
+        self._on_string = handler.on_string
+        self._on_begin_object = handler.on_begin_object
+        self._on_member_name = handler.on_member_name
+        self._on_end_object = handler.on_end_object
+        self._on_begin_array = handler.on_begin_array
+        self._on_end_array = handler.on_end_array
 
     def next_lexeme(self) -> bool:
         self._curr = self._lexer.next_lexeme()
         if self._curr is not None:
-            self._handler.textpos_changed(self._curr_pos().make_copy())
+            if self._textpos_changed is not None:
+                self._textpos_changed(self._curr_pos())
             return True
         return False
     
@@ -502,9 +842,6 @@ class SAXParser:
     def _curr_text(self) -> str:
         return None if self._curr is None else self._curr.text
     
-    def _curr_token(self) -> Token:
-        return Token.UNKNOWN if self._curr is None else self._curr.token
-    
     def run(self):
         self.parse_doc()
 
@@ -521,174 +858,143 @@ class SAXParser:
                 raise JSONParserError(self._curr_pos(), JSONParserMessage.ERR_EXPECTED_EOF, self._curr_text())
 
     def parse_value(self):
-        if self._curr_token_is(Token.BEGIN_ARRAY):
-            self.parse_array()
-        elif self._curr_token_is(Token.BEGIN_OBJECT):
-            self.parse_object()
-        elif self._curr_token_in([Token.LITERAL_FALSE, Token.LITERAL_NULL, Token.LITERAL_TRUE]):
-            self.parse_literal()
-        elif self._curr_token_in([Token.NUMBER_DECIMAL, Token.NUMBER_FLOAT, Token.NUMBER_INT]):
-            self.parse_number()
-        elif self._curr_token_is(Token.STRING):
-            self.parse_string()
-        else:
-            raise JSONParserError(self._curr_pos(), JSONParserMessage.ERR_EXPECTED_VALUE_BUT_FOUND_FMT, self._curr_text())
-
-    def parse_array(self):
-        if not self._curr_token_is(Token.BEGIN_ARRAY):
-            raise JSONParserError(self._curr_pos(), JSONParserMessage.ERR_EXPECTED_ARRAY)
-        self._handler.on_begin_array()
-        element_count = 0
-        if self.next_lexeme() and not self._curr_token_is(Token.END_ARRAY):
-            element_count = self.parse_array_items()
-        if self._curr_token_is(Token.END_ARRAY):
-            self._handler.on_end_array(element_count)
-        else:
-            raise JSONParserError(self._curr_pos(), JSONParserMessage.ERR_UNCLOSED_ARRAY)
-
-    def parse_array_items(self) -> int:
-        element_count = 0
-        is_next_item = True
-        while is_next_item:
-            self.parse_value()
-            element_count += 1;
-            is_next_item = self.next_lexeme() and self._curr_token_is(Token.VALUE_SEPARATOR)
-            if is_next_item and not self.next_lexeme():
-                raise JSONParserError(self._curr_pos(), JSONParserMessage.ERR_EXPECTED_ARRAY_ITEM)
-        return element_count
-
-    def parse_object(self):
-        if not self._curr_token_is(Token.BEGIN_OBJECT):
-            raise JSONParserError(self._curr_pos(), JSONParserMessage.ERR_EXPECTED_OBJECT)
-        start_pos = self._curr_pos().make_copy()
-        self._handler.on_begin_object()
-        member_count = 0
-        if self.next_lexeme() and not self._curr_token_is(Token.END_OBJECT):
-            member_count = self.parse_object_members()
-        if self._curr_token_is(Token.END_OBJECT):
-            self._handler.on_end_object(member_count)
-        else:
-            raise JSONParserError(start_pos, JSONParserMessage.ERR_UNCLOSED_OBJECT)
-
-    def parse_object_members(self) -> int:
-        member_count = 0
-        is_next_member = True
-        while is_next_member:
-            if not self._curr_token_is(Token.STRING):
-                raise JSONParserError(self._curr_pos(), JSONParserMessage.ERR_EXPECTED_MEMBER_NAME)
-            self._handler.on_member_name(self._curr_text())
-            member_count += 1
-            if not self.next_lexeme() or not self._curr_token_is(Token.NAME_SEPARATOR):
-                raise JSONParserError(self._curr_pos(), JSONParserMessage.ERR_EXPECTED_NAME_SEPARATOR)
-            if not self.next_lexeme():
-                raise JSONParserError(self._curr_pos(), JSONParserMessage.ERR_EXPECTED_VALUE)
-            self.parse_value()
-            is_next_member = self.next_lexeme() and self._curr_token_is(Token.VALUE_SEPARATOR)
-            if is_next_member and not self.next_lexeme():
-                raise JSONParserError(self._curr_pos(), JSONParserMessage.ERR_EXPECTED_MEMBER_NAME)
-        return member_count
-
-    def parse_literal(self):
-        if Token.is_literal_token(self._curr_token()):
-            self._handler.on_literal(self._curr.literal_kind, self._curr_text())
-        else:
-            raise JSONParserError(self._curr_pos(), JSONParserMessage.ERR_EXPECTED_LITERAL)
-
-    def parse_number(self):
-        if self._curr_token_in([Token.NUMBER_DECIMAL, Token.NUMBER_FLOAT]):
-            self._handler.on_number(NumericTokenKind.NT_FLOAT, self._curr_text())
-        elif self._curr_token_is(Token.NUMBER_INT):
-            self._handler.on_number(NumericTokenKind.NT_INTEGER, self._curr_text())
-        else:
-            raise JSONParserError(self._curr_pos(), JSONParserMessage.ERR_EXPECTED_NUMBER)
-
-    def parse_string(self):
-        if self._curr_token_is(Token.STRING):
-            self._handler.on_string(self._curr_text())
-        else:
-            raise JSONParserError(self._curr_pos(), JSONParserMessage.ERR_EXPECTED_STRING)
+        """
+        Parses the value starting at the current lexeme.
+        The grammar is driven by the _PARSER_TRANSITIONS table, nested containers are
+        tracked in an explicit stack of [container token, item count, start lexeme] entries
+        """
+        # Hot loop: attributes and methods are bound to locals once
+        transitions = _PARSER_TRANSITIONS
+        lexer_next = self._lexer.next_lexeme
+        textpos_changed = self._textpos_changed
+        on_string = self._on_string
+        on_member_name = self._on_member_name
+        on_number = self._on_number
+        stack = []
+        state = _PS_DOC
+        curr = self._curr
+        while True:
+            transition = transitions[state].get(Token.UNKNOWN if curr is None else curr.token)
+            if transition is None:
+                self._raise_unexpected(state, stack)
+            action, state = transition
+            # Actions are checked from the most frequent ones
+            if action == _PA_NONE:
+                pass  # Name and value separators
+            elif action == _PA_MEMBER_NAME:
+                on_member_name(curr.text)
+            elif action == _PA_STRING:
+                on_string(curr.text)
+            elif action == _PA_NUMBER_INT:
+                on_number(NumericTokenKind.NT_INTEGER, curr.text, curr.value)
+            elif action == _PA_NUMBER_FLOAT:
+                on_number(NumericTokenKind.NT_FLOAT, curr.text, curr.value)
+            elif action == _PA_LITERAL:
+                self._on_literal(curr.literal_kind, curr.text)
+            elif action == _PA_BEGIN_OBJECT:
+                self._on_begin_object()
+                stack.append([Token.BEGIN_OBJECT, 0, curr])
+            elif action == _PA_END_OBJECT:
+                self._on_end_object(stack.pop()[1])
+            elif action == _PA_BEGIN_ARRAY:
+                self._on_begin_array()
+                stack.append([Token.BEGIN_ARRAY, 0, None])
+            elif action == _PA_END_ARRAY:
+                self._on_end_array(stack.pop()[1])
+            if state == _PS_VALUE_END:
+                if not stack:
+                    return
+                container = stack[-1]
+                container[1] += 1
+                state = _PS_ARRAY_NEXT if container[0] == Token.BEGIN_ARRAY else _PS_OBJECT_NEXT
+            curr = self._curr = lexer_next()
+            if textpos_changed is not None and curr is not None:
+                textpos_changed(self._curr_pos())
+
+    def _raise_unexpected(self, state: int, stack: list):
+        msg_id, eof_msg_id = _PARSER_ERRORS[state]
+        if self._curr is None:
+            msg_id = eof_msg_id
+        if msg_id == JSONParserMessage.ERR_UNCLOSED_OBJECT:
+            raise JSONParserError(stack[-1][2].pos, msg_id)
+        elif msg_id == JSONParserMessage.ERR_EXPECTED_VALUE_BUT_FOUND_FMT:
+            raise JSONParserError(self._curr_pos(), msg_id, self._curr_text())
+        raise JSONParserError(self._curr_pos(), msg_id)
 
 #
 # SAX handler basic implementation
 #
-class SimpleStack:
-    def __init__(self) -> None:
-        self._data = list()
-
-    def top(self) -> any:
-        return self._data[-1]
-   
-    def pop(self) -> any:
-        return self._data.pop()
-    
-    def push(self, item):
-        self._data.append(item)
-
-    @property
-    def size(self) -> int:
-        return len(self._data)
+_LT_FALSE   = LiteralTokenKind.LT_FALSE
+_LT_NULL    = LiteralTokenKind.LT_NULL
+_LT_TRUE    = LiteralTokenKind.LT_TRUE
 
 class SAXHandlerBasic(SAXHandlerIntf):
+    # Member names up to this length are shared between the objects built
+    MEMBER_NAME_CACHE_KEY_LEN = 64
+    MEMBER_NAME_CACHE_SIZE    = 2048
 
     def __init__(self) -> None:
-        self._stack = SimpleStack()
+        self._stack = []
+        self._member_names = {}
 
     @property
     def result(self) -> any:
-        if self._stack.size == 0:
+        if len(self._stack) == 0:
             return None
-        elif self._stack.size == 1:
+        elif len(self._stack) == 1:
             return self._stack.pop()
-        raise JSONError(f"Unexpected stack size: {self._stack.size}")
+        raise JSONError(f"Unexpected stack size: {len(self._stack)}")
     
     def on_literal(self, kind: LiteralTokenKind, text: str):
-        if kind == LiteralTokenKind.LT_FALSE:
-            self._stack.push(False)
-        elif kind == LiteralTokenKind.LT_TRUE:
-            self._stack.push(True)
-        elif kind == LiteralTokenKind.LT_NULL:
-            self._stack.push(None)
+        if kind is _LT_FALSE:
+            self._stack.append(False)
+        elif kind is _LT_TRUE:
+            self._stack.append(True)
+        elif kind is _LT_NULL:
+            self._stack.append(None)
         else:
             raise JSONError(f"Unsupported literal kind: {str(kind)}. Value: {text}")
 
-    def on_number(self, kind: NumericTokenKind, text: str):
-        if kind == NumericTokenKind.NT_INTEGER:
-            self._stack.push(int(text))
-        elif kind in [NumericTokenKind.NT_DECIMAL, NumericTokenKind.NT_FLOAT]:
-            self._stack.push(float(text))
-        else:
-            raise JSONError(f"Unsupported number kind: {str(kind)}. Value: {text}")
+    def on_number(self, kind: NumericTokenKind, text: str, value: typing.Union[int, float] = None):
+        if value is None:
+            if kind == NumericTokenKind.NT_INTEGER:
+                value = int(text)
+            elif kind in (NumericTokenKind.NT_DECIMAL, NumericTokenKind.NT_FLOAT):
+                value = float(text)
+            else:
+                raise JSONError(f"Unsupported number kind: {str(kind)}. Value: {text}")
+        self._stack.append(value)
 
     def on_string(self, text: str):
-        self._stack.push(text)
+        self._stack.append(text)
 
     def on_begin_object(self):
         pass
 
     def on_member_name(self, text: str):
-        self._stack.push(text)
+        if len(text) <= self.MEMBER_NAME_CACHE_KEY_LEN:
+            names = self._member_names
+            text = names.setdefault(text, text)
+            if len(names) > self.MEMBER_NAME_CACHE_SIZE:
+                names.clear()
+        self._stack.append(text)
 
     def on_end_object(self, member_count: int): 
         member_item_count = member_count * 2  # Two items per member: name and value
-        if member_item_count > self._stack.size:
-            raise JSONError(f"Element count {member_item_count} is greater than stack size {self._stack.size}")
-        obj = {}
-        for _i in range(member_count):
-            value = self._stack.pop()
-            name = self._stack.pop()
-            obj[name] = value
-        self._stack.push(obj)
+        if member_item_count > len(self._stack):
+            raise JSONError(f"Element count {member_item_count} is greater than stack size {len(self._stack)}")
+        start = len(self._stack) - member_item_count
+        items = self._stack[start:]
+        del self._stack[start:]
+        self._stack.append(dict(zip(items[0::2], items[1::2])))
 
     def on_begin_array(self):
         pass
 
     def on_end_array(self, element_count: int):
-        if element_count > self._stack.size:
-            raise JSONError(f"Element count {element_count} is greater than stack size {self._stack.size}")
-        array = []
-        for _i in range(element_count):
-            array.insert(0, self._stack.pop())
-        self._stack.push(array)
-
-    def textpos_changed(self, pos: TextPos):
-        pass
+        if element_count > len(self._stack):
+            raise JSONError(f"Element count {element_count} is greater than stack size {len(self._stack)}")
+        start = len(self._stack) - element_count
+        array = self._stack[start:]
+        del self._stack[start:]
+        self._stack.append(array)
@@ -15,50 +15,113 @@ import os
 import unittest
 
 sys.path.append(os.path.realpath(os.path.join(os.path.dirname(__file__), "..")))
-from json_sax import TextPos, Token, Lexeme, Lexer, JSONParserError, JSONParserMessage, \
-    SAXHandlerBasic, SAXParser
+from json_sax import TextPos, Token, Lexeme, Lexer, JSONError, JSONParserError, JSONParserMessage, \
+    NumericTokenKind, SAXHandlerBasic, SAXParser
+
+
+# Lexer cases: (input, expected lexeme, title)
+_SIMPLE_TOKEN_CASES = (
+    ("[", Lexeme(TextPos(1, 1), Token.BEGIN_ARRAY, "["), "Begin array 1.1"),
+    (" \t[", Lexeme(TextPos(1, 3), Token.BEGIN_ARRAY, "["), "Begin array 1.2"),
+    ("\r\n[", Lexeme(TextPos(2, 1), Token.BEGIN_ARRAY, "["), "Begin array 1.3"),
+    (" \t\r\n[", Lexeme(TextPos(2, 1), Token.BEGIN_ARRAY, "["), "Begin array 1.4"),
+    (" \t\r\n \t[", Lexeme(TextPos(2, 3), Token.BEGIN_ARRAY, "["), "Begin array 1.5"),
+    ("\r\n\r\n\t[", Lexeme(TextPos(3, 2), Token.BEGIN_ARRAY, "["), "Begin array 1.6"),
+    ("\n[", Lexeme(TextPos(2, 1), Token.BEGIN_ARRAY, "["), "Begin array 1.7"),
+    ("{", Lexeme(TextPos(1, 1), Token.BEGIN_OBJECT, "{"), "Begin object 1.1"),
+    ("]", Lexeme(TextPos(1, 1), Token.END_ARRAY, "]"), "End array 1.1"),
+    ("}", Lexeme(TextPos(1, 1), Token.END_OBJECT, "}"), "End object 1.1"),
+    ("false", Lexeme(TextPos(1, 1), Token.LITERAL_FALSE, "false"), "Literal 1.1"),
+    ("null", Lexeme(TextPos(1, 1), Token.LITERAL_NULL, "null"), "Literal 2.1"),
+    ("true", Lexeme(TextPos(1, 1), Token.LITERAL_TRUE, "true"), "Literal 3.1"),
+    (":", Lexeme(TextPos(1, 1), Token.NAME_SEPARATOR, ":"), "Name separator 1.1"),
+    (",", Lexeme(TextPos(1, 1), Token.VALUE_SEPARATOR, ","), "Value separator 1.1")
+)
+
+_STRING_CASES = (
+    ("\"Hello world!\"", Lexeme(TextPos(1, 1), Token.STRING, "Hello world!"), "String 1"),
+    ("\"\\\"\"", Lexeme(TextPos(1, 1), Token.STRING, "\""), "String 2.1"),
+    ("\"\\\\\"", Lexeme(TextPos(1, 1), Token.STRING, "\\"), "String 2.2"),
+    ("\"\\/\"", Lexeme(TextPos(1, 1), Token.STRING, "/"), "String 2.3"),
+    ("\"\\b\"", Lexeme(TextPos(1, 1), Token.STRING, "\b"), "String 2.4"),
+    ("\"\\f\"", Lexeme(TextPos(1, 1), Token.STRING, "\f"), "String 2.5"),
+    ("\"\\n\"", Lexeme(TextPos(1, 1), Token.STRING, "\n"), "String 2.6"),
+    ("\"\\r\"", Lexeme(TextPos(1, 1), Token.STRING, "\r"), "String 2.7"),
+    ("\"\\t\"", Lexeme(TextPos(1, 1), Token.STRING, "\t"), "String 2.8"),
+    ("\"-\\\"-\\\\-\\/-\\b-\\f-\\n-\\r-\\t-\"", Lexeme(TextPos(1, 1), Token.STRING, "-\"-\\-/-\b-\f-\n-\r-\t-"), "String 2.9"),
+    ("\"Строка déjà\"", Lexeme(TextPos(1, 1), Token.STRING, "Строка déjà"), "String 3.3"),
+    ("\"\b\"", Lexeme(TextPos(1, 1), Token.STRING, "\b"), "String 3.4"),
+    ("\"\"", Lexeme(TextPos(1, 1), Token.STRING, ""), "String 4.1")
+)
+
+_ESCAPE_SEQUENCE_CASES = (
+    ("\"\\u1234\"", Lexeme(TextPos(1, 1), Token.STRING, "\u1234"), "ESC 1.1"),
+    ("\"\\u0022\"", Lexeme(TextPos(1, 1), Token.STRING, "\u0022"), "ESC 1.2"),
+    ("\"\\u00ff\"", Lexeme(TextPos(1, 1), Token.STRING, "\u00ff"), "ESC 1.3"),
+    ("\"Abc\\u1234Def\"", Lexeme(TextPos(1, 1), Token.STRING, "Abc\u1234""Def"), "ESC 2.2"),
+    ("\"\\u00e9\\u00C9\"", Lexeme(TextPos(1, 1), Token.STRING, "\u00e9\u00c9"), "ESC 2.3")
+)
+
+_NUMBER_CASES = (
+    ("12345", Lexeme(TextPos(1, 1), Token.NUMBER_INT, "12345"), "Num 1.1"),
+    ("-12345", Lexeme(TextPos(1, 1), Token.NUMBER_INT, "-12345"), "Num 1.2"),
+    ("123.456", Lexeme(TextPos(1, 1), Token.NUMBER_DECIMAL, "123.456"), "Num 2.1"),
+    ("-123.456", Lexeme(TextPos(1, 1), Token.NUMBER_DECIMAL, "-123.456"), "Num 2.2"),
+    ("1.23456E10", Lexeme(TextPos(1, 1), Token.NUMBER_FLOAT, "1.23456E10"), "Num 3.1"),
+    ("1.23456e10", Lexeme(TextPos(1, 1), Token.NUMBER_FLOAT, "1.23456e10"), "Num 3.2"),
+    ("1.23456E+10", Lexeme(TextPos(1, 1), Token.NUMBER_FLOAT, "1.23456E+10"), "Num 3.11"),
+    ("1.23456e+10", Lexeme(TextPos(1, 1), Token.NUMBER_FLOAT, "1.23456e+10"), "Num 3.21"),
+    ("-1.23456E10", Lexeme(TextPos(1, 1), Token.NUMBER_FLOAT, "-1.23456E10"), "Num 3.3"),
+    ("-1.23456e10", Lexeme(TextPos(1, 1), Token.NUMBER_FLOAT, "-1.23456e10"), "Num 3.4"),
+    ("1.23456E-10", Lexeme(TextPos(1, 1), Token.NUMBER_FLOAT, "1.23456E-10"), "Num 3.5"),
+    ("1.23456e-10", Lexeme(TextPos(1, 1), Token.NUMBER_FLOAT, "1.23456e-10"), "Num 3.6"),
+    ("-1.23456E-10", Lexeme(TextPos(1, 1), Token.NUMBER_FLOAT, "-1.23456E-10"), "Num 3.7"),
+    ("-1.23456e-10", Lexeme(TextPos(1, 1), Token.NUMBER_FLOAT, "-1.23456e-10"), "Num 3.8"),
+    ("0", Lexeme(TextPos(1, 1), Token.NUMBER_INT, "0"), "Num 4.1"),
+    ("-0", Lexeme(TextPos(1, 1), Token.NUMBER_INT, "-0"), "Num 4.2"),
+    ("0.0", Lexeme(TextPos(1, 1), Token.NUMBER_DECIMAL, "0.0"), "Num 4.3"),
+    ("-0.0", Lexeme(TextPos(1, 1), Token.NUMBER_DECIMAL, "-0.0"), "Num 4.4"),
+    ("0.0e0", Lexeme(TextPos(1, 1), Token.NUMBER_FLOAT, "0.0e0"), "Num 4.5"),
+    ("-0.0e-0", Lexeme(TextPos(1, 1), Token.NUMBER_FLOAT, "-0.0e-0"), "Num 4.6")
+)
 
 
 class JsonLexerTest(unittest.TestCase):
+    # Shared by the checks, restarted on each input
+    _LEXER = Lexer("")
 
     def _compare_lexemes(self, expected: Lexeme, lex: Lexeme, title: str):
-        title += ": "
-        self.assertEqual(expected.token, lex.token, title + "expected token: " + str(expected.token) + ", got: " + str(lex.token))
-        self.assertEqual(expected.pos, lex.pos, title + "expected: " + str(expected.pos) + " got: " + str(lex.pos))
-        self.assertEqual(expected.text, lex.text, title + "text")
+        self.assertEqual((expected.token, expected.pos, expected.text), (lex.token, lex.pos, lex.text), title)
 
     def _check_lexeme(self, input: str, expected: Lexeme, title: str):
-        reader = io.StringIO(input)
-        lexer  = Lexer(reader)
+        lexer = self._LEXER
+        lexer.reset(io.StringIO(input))
         lex = lexer.next_lexeme()
         self.assertIsNotNone(lex, title + ": next_lexeme() failed with no errors")
         self._compare_lexemes(expected, lex, title)
 
     def _check_error(self, input: str, msg_id: int, pos: TextPos, title: str):
         title2 = title + ": "
-        reader = io.StringIO(input)
-        lexer  = Lexer(reader)
-        caught_error = False
-        try:
+        lexer = self._LEXER
+        lexer.reset(io.StringIO(input))
+        with self.assertRaises(JSONParserError, msg = title2 + "no errors") as ctx:
             while lexer.next_lexeme():
                 pass
-        except JSONParserError as ex:
-            caught_error = True
-            self.assertTrue(ex.msg_id == msg_id, title2 + f"origin. {str(ex)}")
-            self.assertTrue(str(ex) != "" , title2 + "text is empty")
-            self.assertEqual(pos, ex.pos, title2 + f"error pos. {str(ex)}")
-        self.assertTrue(caught_error, title2 + "no errors")
-
-    def _check_text(self, input: str, expected: list, title: str):
+        ex = ctx.exception
+        self.assertEqual(msg_id, ex.msg_id, title2 + f"origin. {str(ex)}")
+        self.assertTrue(str(ex) != "" , title2 + "text is empty")
+        self.assertEqual(pos, ex.pos, title2 + f"error pos. {str(ex)}")
+
+    def _check_text(self, input: str, expected: list, title: str, lexer_class: type = Lexer):
         reader = io.StringIO(input)
-        lexer  = Lexer(reader)
+        if lexer_class is Lexer:
+            lexer = self._LEXER
+            lexer.reset(reader)
+        else:
+            lexer = lexer_class(reader)
         title2 = title + ": "
-        i = 0;
-        lex = None
-        while True:
-            lex = lexer.next_lexeme()
-            if lex is None:
-                break
+        i = 0
+        for lex in lexer:
             self.assertTrue(i < len(expected), title2 + f"lex count {i + 1} exceeds expected one {len(expected)}")
             expected_lex = expected[i]
             self._compare_lexemes(expected_lex, lex, f"{title} lexeme[{i}]")
@@ -70,66 +133,43 @@ class JsonLexerTest(unittest.TestCase):
         reader = io.StringIO(input)
         lexer  = Lexer(reader)
         self.assertIsNone(lexer.next_lexeme())
+        lexer  = Lexer("")
+        self.assertIsNone(lexer.next_lexeme())
 
     def test_simple_tokens(self):
-        self._check_lexeme("[", Lexeme(TextPos(1, 1), Token.BEGIN_ARRAY, "["), "Begin array 1.1")
-        self._check_lexeme(" \t[", Lexeme(TextPos(1, 3), Token.BEGIN_ARRAY, "["), "Begin array 1.2")
-        self._check_lexeme("\r\n[", Lexeme(TextPos(2, 1), Token.BEGIN_ARRAY, "["), "Begin array 1.3")
-        self._check_lexeme(" \t\r\n[", Lexeme(TextPos(2, 1), Token.BEGIN_ARRAY, "["), "Begin array 1.4")
-        self._check_lexeme(" \t\r\n \t[", Lexeme(TextPos(2, 3), Token.BEGIN_ARRAY, "["), "Begin array 1.5")
-        self._check_lexeme("\r\n\r\n\t[", Lexeme(TextPos(3, 2), Token.BEGIN_ARRAY, "["), "Begin array 1.6")
-        self._check_lexeme("\n[", Lexeme(TextPos(2, 1), Token.BEGIN_ARRAY, "["), "Begin array 1.7")
-        self._check_lexeme("{", Lexeme(TextPos(1, 1), Token.BEGIN_OBJECT, "{"), "Begin object 1.1")
-        self._check_lexeme("]", Lexeme(TextPos(1, 1), Token.END_ARRAY, "]"), "End array 1.1")
-        self._check_lexeme("}", Lexeme(TextPos(1, 1), Token.END_OBJECT, "}"), "End object 1.1")
-        self._check_lexeme("false", Lexeme(TextPos(1, 1), Token.LITERAL_FALSE, "false"), "Literal 1.1")
-        self._check_lexeme("null", Lexeme(TextPos(1, 1), Token.LITERAL_NULL, "null"), "Literal 2.1")
-        self._check_lexeme("true", Lexeme(TextPos(1, 1), Token.LITERAL_TRUE, "true"), "Literal 3.1")
-        self._check_lexeme(":", Lexeme(TextPos(1, 1), Token.NAME_SEPARATOR, ":"), "Name separator 1.1")
-        self._check_lexeme(",", Lexeme(TextPos(1, 1), Token.VALUE_SEPARATOR, ","), "Value separator 1.1")
+        for input, expected, title in _SIMPLE_TOKEN_CASES:
+            with self.subTest(title):
+                self._check_lexeme(input, expected, title)
 
     def test_strings(self):
-        self._check_lexeme("\"Hello world!\"", Lexeme(TextPos(1, 1), Token.STRING, "Hello world!"), "String 1")
-        self._check_lexeme("\"\\\"\"", Lexeme(TextPos(1, 1), Token.STRING, "\""), "String 2.1")
-        self._check_lexeme("\"\\\\\"", Lexeme(TextPos(1, 1), Token.STRING, "\\"), "String 2.2")
-        self._check_lexeme("\"\\/\"", Lexeme(TextPos(1, 1), Token.STRING, "/"), "String 2.3")
-        self._check_lexeme("\"\\b\"", Lexeme(TextPos(1, 1), Token.STRING, "\b"), "String 2.4")
-        self._check_lexeme("\"\\f\"", Lexeme(TextPos(1, 1), Token.STRING, "\f"), "String 2.5")
-        self._check_lexeme("\"\\n\"", Lexeme(TextPos(1, 1), Token.STRING, "\n"), "String 2.6")
-        self._check_lexeme("\"\\r\"", Lexeme(TextPos(1, 1), Token.STRING, "\r"), "String 2.7")
-        self._check_lexeme("\"\\t\"", Lexeme(TextPos(1, 1), Token.STRING, "\t"), "String 2.8")
-        self._check_lexeme("\"-\\\"-\\\\-\\/-\\b-\\f-\\n-\\r-\\t-\"", Lexeme(TextPos(1, 1), Token.STRING, "-\"-\\-/-\b-\f-\n-\r-\t-"), "String 2.9")
-        self._check_lexeme("\"Строка déjà\"", Lexeme(TextPos(1, 1), Token.STRING, "Строка déjà"), "String 3.3")
-        self._check_lexeme("\"\b\"", Lexeme(TextPos(1, 1), Token.STRING, "\b"), "String 3.4")
+        for input, expected, title in _STRING_CASES:
+            with self.subTest(title):
+                self._check_lexeme(input, expected, title)
 
     def test_escape_sequences(self):
-        self._check_lexeme("\"\\u1234\"", Lexeme(TextPos(1, 1), Token.STRING, "\u1234"), "ESC 1.1")
-        self._check_lexeme("\"\\u0022\"", Lexeme(TextPos(1, 1), Token.STRING, "\u0022"), "ESC 1.2")
-        self._check_lexeme("\"\\u00ff\"", Lexeme(TextPos(1, 1), Token.STRING, "\u00ff"), "ESC 1.3")
-        self._check_lexeme("\"Abc\\u1234Def\"", Lexeme(TextPos(1, 1), Token.STRING, "Abc\u1234""Def"), "ESC 2.2")
-
+        for input, expected, title in _ESCAPE_SEQUENCE_CASES:
+            with self.subTest(title):
+                self._check_lexeme(input, expected, title)
 
     def test_numbers(self):
-        self._check_lexeme("12345", Lexeme(TextPos(1, 1), Token.NUMBER_INT, "12345"), "Num 1.1")
-        self._check_lexeme("-12345", Lexeme(TextPos(1, 1), Token.NUMBER_INT, "-12345"), "Num 1.2")
-        self._check_lexeme("123.456", Lexeme(TextPos(1, 1), Token.NUMBER_DECIMAL, "123.456"), "Num 2.1")
-        self._check_lexeme("-123.456", Lexeme(TextPos(1, 1), Token.NUMBER_DECIMAL, "-123.456"), "Num 2.2")
-        self._check_lexeme("1.23456E10", Lexeme(TextPos(1, 1), Token.NUMBER_FLOAT, "1.23456E10"), "Num 3.1")
-        self._check_lexeme("1.23456e10", Lexeme(TextPos(1, 1), Token.NUMBER_FLOAT, "1.23456e10"), "Num 3.2")
-        self._check_lexeme("1.23456E+10", Lexeme(TextPos(1, 1), Token.NUMBER_FLOAT, "1.23456E+10"), "Num 3.11")
-        self._check_lexeme("1.23456e+10", Lexeme(TextPos(1, 1), Token.NUMBER_FLOAT, "1.23456e+10"), "Num 3.21")
-        self._check_lexeme("-1.23456E10", Lexeme(TextPos(1, 1), Token.NUMBER_FLOAT, "-1.23456E10"), "Num 3.3")
-        self._check_lexeme("-1.23456e10", Lexeme(TextPos(1, 1), Token.NUMBER_FLOAT, "-1.23456e10"), "Num 3.4")
-        self._check_lexeme("1.23456E-10", Lexeme(TextPos(1, 1), Token.NUMBER_FLOAT, "1.23456E-10"), "Num 3.5")
-        self._check_lexeme("1.23456e-10", Lexeme(TextPos(1, 1), Token.NUMBER_FLOAT, "1.23456e-10"), "Num 3.6")
-        self._check_lexeme("-1.23456E-10", Lexeme(TextPos(1, 1), Token.NUMBER_FLOAT, "-1.23456E-10"), "Num 3.7")
-        self._check_lexeme("-1.23456e-10", Lexeme(TextPos(1, 1), Token.NUMBER_FLOAT, "-1.23456e-10"), "Num 3.8")
-        self._check_lexeme("0", Lexeme(TextPos(1, 1), Token.NUMBER_INT, "0"), "Num 4.1")
-        self._check_lexeme("-0", Lexeme(TextPos(1, 1), Token.NUMBER_INT, "-0"), "Num 4.2")
-        self._check_lexeme("0.0", Lexeme(TextPos(1, 1), Token.NUMBER_DECIMAL, "0.0"), "Num 4.3")
-        self._check_lexeme("-0.0", Lexeme(TextPos(1, 1), Token.NUMBER_DECIMAL, "-0.0"), "Num 4.4")
-        self._check_lexeme("0.0e0", Lexeme(TextPos(1, 1), Token.NUMBER_FLOAT, "0.0e0"), "Num 4.5")
-        self._check_lexeme("-0.0e-0", Lexeme(TextPos(1, 1), Token.NUMBER_FLOAT, "-0.0e-0"), "Num 4.6")
+        for input, expected, title in _NUMBER_CASES:
+            with self.subTest(title):
+                self._check_lexeme(input, expected, title)
+
+    def test_number_values(self):
+        for text, value in [("12345", 12345), ("-0", 0), ("-123.456", -123.456), ("1.23456e+10", 1.23456e+10)]:
+            lex = Lexer(text).next_lexeme()
+            self.assertEqual(type(value), type(lex.value), text)
+            self.assertEqual(value, lex.value, text)
+        # Integers over the int digits limit of Python keep their text only
+        digits = "9" * 5000
+        for text in [digits, "[" + digits + "]"]:
+            lex = None
+            for lex in Lexer(text):
+                if lex.token == Token.NUMBER_INT:
+                    break
+            self.assertEqual(digits, lex.text, "Long int 1.1")
+            self.assertIsNone(lex.value, "Long int 1.2")
 
     def test_texts(self):
         self._check_text("", [], "Test 1")
@@ -175,6 +215,70 @@ class JsonLexerTest(unittest.TestCase):
             ],
             "Test 5")
 
+    def test_buffer_boundaries(self):
+        text = "[\"Abc\\u1234\\nDef\",\n -1.5e+10, true, null]"
+        expected = [
+            Lexeme(TextPos(1, 1), Token.BEGIN_ARRAY, "["),
+            Lexeme(TextPos(1, 2), Token.STRING, "Abc\u1234\nDef"),
+            Lexeme(TextPos(1, 18), Token.VALUE_SEPARATOR, ","),
+            Lexeme(TextPos(2, 2), Token.NUMBER_FLOAT, "-1.5e+10"),
+            Lexeme(TextPos(2, 10), Token.VALUE_SEPARATOR, ","),
+            Lexeme(TextPos(2, 12), Token.LITERAL_TRUE, "true"),
+            Lexeme(TextPos(2, 16), Token.VALUE_SEPARATOR, ","),
+            Lexeme(TextPos(2, 18), Token.LITERAL_NULL, "null"),
+            Lexeme(TextPos(2, 22), Token.END_ARRAY, "]")
+        ]
+        for size in range(1, 8):
+            lexer_class = type("SmallBufferLexer", (Lexer,), {"READ_BUFFER_SIZE": size})
+            self._check_text(text, expected, f"Buffer size {size}", lexer_class)
+
+    def test_reset(self):
+        lexer = Lexer(io.StringIO("[1, 2"))
+        self.assertEqual(Token.BEGIN_ARRAY, lexer.next_lexeme().token, "Reset 1.1")
+        self.assertEqual(Token.NUMBER_INT, lexer.next_lexeme().token, "Reset 1.2")
+        lexer.reset("\n true")
+        lex = lexer.next_lexeme()
+        self._compare_lexemes(Lexeme(TextPos(2, 2), Token.LITERAL_TRUE, "true"), lex, "Reset 2.1")
+        self.assertIsNone(lexer.next_lexeme(), "Reset 2.2")
+        self.assertTrue(lexer.eof(), "Reset 2.3")
+
+    def test_deferred_positions(self):
+        # Positions requested after the whole text is read, in reverse order
+        text = "[\"a\",\n  1,\ntrue ,\n\n{}]"
+        expected = [TextPos(1, 1), TextPos(1, 2), TextPos(1, 5), TextPos(2, 3), TextPos(2, 4),
+                    TextPos(3, 1), TextPos(3, 6), TextPos(5, 1), TextPos(5, 2), TextPos(5, 3)]
+        for size in [1, 3, Lexer.READ_BUFFER_SIZE]:
+            lexer_class = type("SmallBufferLexer", (Lexer,), {"READ_BUFFER_SIZE": size})
+            for source in [io.StringIO(text), text]:
+                lexer = lexer_class(source)
+                lexemes = list(lexer)
+                self.assertListEqual(expected[::-1], [lex.pos for lex in reversed(lexemes)], f"Buffer size {size}")
+
+    def test_deferred_positions_cursor(self):
+        # Positions resolved after an error at the end of the text or from a previous stream buffer
+        # move the line cursor back to them, the next positions count only the lines from there
+        items = ",\n".join(["[1, \"a\", true]"] * 8000)
+        text = "[" + items + "]"
+        def lex_to_error(source) -> list:
+            lexemes = []
+            with self.assertRaises(JSONParserError):
+                for lex in Lexer(source):
+                    lexemes.append(lex)
+            return lexemes
+        expected = [lex.pos for lex in Lexer(text)]
+        for lexemes, title in [(list(Lexer(io.StringIO(text))), "Deferred 1"),
+                               (lex_to_error("[" + items + ",\n x"), "Deferred 2")]:
+            positions = []
+            not_moved = []  # Indexes of the lexemes the cursor is not moved to
+            for i, lex in enumerate(lexemes):
+                lines, idx = lex._lines, lex._idx
+                pos = lex.pos
+                positions.append(pos)
+                if (lines._line_idx, lines._line) != (idx, pos.line):
+                    not_moved.append(i)
+            self.assertListEqual(expected, positions, title + ".1")
+            self.assertListEqual([], not_moved[:10], title + ".2")
+
     def test_lexer_errors(self):
         self._check_error("try", JSONParserMessage.ERR_INVALID_LITERAL_FMT, TextPos(1, 1), "E1010.1")
         self._check_error("\ntrue2", JSONParserMessage.ERR_INVALID_LITERAL_FMT, TextPos(2, 1), "E1010.2")
@@ -191,10 +295,17 @@ class JsonLexerTest(unittest.TestCase):
         self._check_error("1eA", JSONParserMessage.ERR_INVALID_NUMBER, TextPos(1, 3), "E1012.6")
         self._check_error("1e-1A", JSONParserMessage.ERR_INVALID_NUMBER, TextPos(1, 5), "E1012.7")
         self._check_error("00", JSONParserMessage.ERR_INVALID_NUMBER, TextPos(1, 2), "E1012.8")
+        self._check_error("-00", JSONParserMessage.ERR_INVALID_NUMBER, TextPos(1, 3), "E1012.9")
+        self._check_error("--1", JSONParserMessage.ERR_INVALID_NUMBER, TextPos(1, 2), "E1012.10")
+        self._check_error("1-2", JSONParserMessage.ERR_INVALID_NUMBER, TextPos(1, 2), "E1012.11")
+        self._check_error("+1", JSONParserMessage.ERR_INVALID_NUMBER, TextPos(1, 1), "E1012.12")
+        self._check_error("1.5.2", JSONParserMessage.ERR_INVALID_NUMBER, TextPos(1, 4), "E1012.13")
+        self._check_error("1e5e5", JSONParserMessage.ERR_INVALID_NUMBER, TextPos(1, 4), "E1012.14")
         #
         self._check_error("\"\\u123\"", JSONParserMessage.ERR_UNALLOWED_ESCAPE_SEQ, TextPos(1, 2), "E1040.1")
         self._check_error("\"\\u123H\"", JSONParserMessage.ERR_UNALLOWED_ESCAPE_SEQ, TextPos(1, 2), "E1040.2")
         self._check_error("\"\\uABCD\\u123H\"", JSONParserMessage.ERR_UNALLOWED_ESCAPE_SEQ, TextPos(1, 8), "E1040.3")
+        self._check_error("\"\\u12\u00b23\"", JSONParserMessage.ERR_UNALLOWED_ESCAPE_SEQ, TextPos(1, 2), "E1040.4")
         #
         self._check_error("\"", JSONParserMessage.ERR_UNCLOSED_STRING, TextPos(1, 1), "E1050.1")
         self._check_error("\"Hello", JSONParserMessage.ERR_UNCLOSED_STRING, TextPos(1, 6), "E1050.2")
@@ -210,19 +321,28 @@ class JsonLexerTest(unittest.TestCase):
 class SAXParserTest(unittest.TestCase):
 
     def _check_json(self, text: str, expected, title: str):
-        reader = io.StringIO(text)
-        handler = SAXHandlerBasic()
-        parser = SAXParser(reader, handler)
-        parser.run()
-        result = handler.result
-        self.assertEqual(type(result), type(expected))
-        if isinstance(result, list):
-            self.assertListEqual(result, expected)
-        elif isinstance(result, dict):
-            self.assertDictEqual(result, expected)
-        else:
-            self.assertEqual(result, expected)
+        # Both stream and in-memory text sources
+        for source in [io.StringIO(text), text, text.encode("utf-8")]:
+            handler = SAXHandlerBasic()
+            parser = SAXParser(source, handler)
+            parser.run()
+            result = handler.result
+            self.assertEqual(type(result), type(expected), title)
+            if isinstance(result, list):
+                self.assertListEqual(result, expected, title)
+            elif isinstance(result, dict):
+                self.assertDictEqual(result, expected, title)
+            else:
+                self.assertEqual(result, expected, title)
     
+    def _check_error(self, text: str, msg_id: int, pos: TextPos, title: str):
+        title2 = title + ": "
+        with self.assertRaises(JSONParserError, msg = title2 + "no errors") as ctx:
+            SAXParser(io.StringIO(text), SAXHandlerBasic()).run()
+        ex = ctx.exception
+        self.assertEqual(msg_id, ex.msg_id, title2 + f"origin. {str(ex)}")
+        self.assertEqual(pos, ex.pos, title2 + f"error pos. {str(ex)}")
+
     def test_empty_stream(self):
         self._check_json("", None, "Literals 1")
 
@@ -235,6 +355,36 @@ class SAXParserTest(unittest.TestCase):
         self._check_json("123", 123, "Numeric 1")
         self._check_json("123.456", 123.456, "Numeric 2")
         self._check_json("1.23456e+08", 1.23456e+08, "Numeric 3")
+        self._check_json("12345678901234567890123", 12345678901234567890123, "Numeric 4")
+        self._check_json("[0, -7, 1.5, -2e-3, 99999999999999999999]", [0, -7, 1.5, -2e-3, 99999999999999999999], "Numeric 5")
+
+    def test_values_long_integer(self):
+        class TextHandler(SAXHandlerBasic):
+            def on_number(self, kind: NumericTokenKind, text: str, value=None):
+                self._stack.append(text)
+        digits = "9" * 5000
+        for text, expected, title in [("[" + digits + "]", [digits], "Long int 1.1"), (digits, digits, "Long int 1.2")]:
+            handler = TextHandler()
+            SAXParser(io.StringIO(text), handler).run()
+            self.assertEqual(expected, handler.result, title)
+
+    def test_values_number_text_only(self):
+        class TextOnlyHandler(SAXHandlerBasic):
+            def on_number(self, kind: NumericTokenKind, text: str):
+                self._stack.append(text)
+        handler = TextOnlyHandler()
+        SAXParser("[1, -2.5e3]", handler).run()
+        self.assertListEqual(["1", "-2.5e3"], handler.result, "Text only 1.1")
+        class ForwardingHandler(SAXHandlerBasic):
+            def on_number(self, kind: NumericTokenKind, text: str):
+                super().on_number(kind, text)
+        handler = ForwardingHandler()
+        SAXParser("[1, -2.5e3, 0.5]", handler).run()
+        result = handler.result
+        self.assertListEqual([1, -2.5e3, 0.5], result, "Text only 2.1")
+        self.assertListEqual([int, float, float], [type(value) for value in result], "Text only 2.2")
+        with self.assertRaises(JSONError, msg = "Text only 3.1"):
+            SAXHandlerBasic().on_number(NumericTokenKind.NT_UNKNOWN, "1")
 
     def test_values_strings(self):
         self._check_json("\"Hello world!\"", "Hello world!", "String 1")
@@ -271,6 +421,91 @@ class SAXParserTest(unittest.TestCase):
             {"Prop 1": [1, 2, 3], "Prop 2": {"Prop 2.1": True}, "Prop 3": "Str value"},
             "Obj 3.1")
 
+    def test_parser_errors(self):
+        self._check_error("[1,", JSONParserMessage.ERR_EXPECTED_ARRAY_ITEM, TextPos(1, 3), "E2105.1")
+        self._check_error("[1] ]", JSONParserMessage.ERR_EXPECTED_EOF, TextPos(1, 5), "E2107.1")
+        self._check_error("{,}", JSONParserMessage.ERR_EXPECTED_MEMBER_NAME, TextPos(1, 2), "E2112.1")
+        self._check_error("{\"a\":1,}", JSONParserMessage.ERR_EXPECTED_MEMBER_NAME, TextPos(1, 8), "E2112.2")
+        self._check_error("{\"a\" 1}", JSONParserMessage.ERR_EXPECTED_NAME_SEPARATOR, TextPos(1, 7), "E2014.1")
+        self._check_error("{\"a\":", JSONParserMessage.ERR_EXPECTED_VALUE, TextPos(1, 5), "E2150.1")
+        self._check_error("[1,]", JSONParserMessage.ERR_EXPECTED_VALUE_BUT_FOUND_FMT, TextPos(1, 4), "E2155.1")
+        self._check_error("{\"a\":}", JSONParserMessage.ERR_EXPECTED_VALUE_BUT_FOUND_FMT, TextPos(1, 6), "E2155.2")
+        self._check_error("[", JSONParserMessage.ERR_UNCLOSED_ARRAY, TextPos(1, 1), "E2290.1")
+        self._check_error("[1 2]", JSONParserMessage.ERR_UNCLOSED_ARRAY, TextPos(1, 5), "E2290.2")
+        self._check_error("{", JSONParserMessage.ERR_UNCLOSED_OBJECT, TextPos(1, 1), "E2295.1")
+        self._check_error("[{\"a\":1 \"b\":2}]", JSONParserMessage.ERR_UNCLOSED_OBJECT, TextPos(1, 2), "E2295.2")
+        self._check_error("[1] [2]", JSONParserMessage.ERR_UNEXPECTED_LEXEME_FMT, TextPos(1, 7), "E2300.1")
+
+    def test_error_messages(self):
+        for text, expected in [
+            ("try", "Line: 1, col: 1. Invalid literal: try"),
+            ("[1,]", "Line: 1, col: 4. Expected value but ']' found"),
+            ("[1] [2]", "Line: 1, col: 7. Unexpected '2'"),
+            ("[", "Line: 1, col: 1. Unclosed array")]:
+            with self.assertRaises(JSONParserError) as ctx:
+                SAXParser(io.StringIO(text), SAXHandlerBasic()).run()
+            self.assertEqual(expected, str(ctx.exception), text)
+
+    def test_objects_member_order(self):
+        handler = SAXHandlerBasic()
+        SAXParser(io.StringIO("{\"b\": 1, \"a\": 2, \"c\": 3, \"a\": 4}"), handler).run()
+        result = handler.result
+        self.assertListEqual(["b", "a", "c"], list(result.keys()), "Obj order 1.1")
+        self.assertEqual(4, result["a"], "Obj order 1.2")
+
+    def test_member_names_shared(self):
+        handler = SAXHandlerBasic()
+        SAXParser("[{\"name\": 1}, {\"name\": 2}]", handler).run()
+        result = handler.result
+        self.assertListEqual([{"name": 1}, {"name": 2}], result, "Names 1.1")
+        self.assertIs(list(result[0])[0], list(result[1])[0], "Names 1.2")
+
+    def test_textpos_changed(self):
+        class PosHandler(SAXHandlerBasic):
+            def __init__(self) -> None:
+                super().__init__()
+                self.positions = []
+            def textpos_changed(self, pos: TextPos):
+                self.positions.append(pos)
+        handler = PosHandler()
+        SAXParser(io.StringIO("[1,\n true]"), handler).run()
+        self.assertListEqual([1, True], handler.result, "Pos 1.1")
+        self.assertListEqual(
+            [TextPos(1, 1), TextPos(1, 3), TextPos(1, 3), TextPos(2, 6), TextPos(2, 6)],
+            handler.positions,
+            "Pos 1.2")
+
+    def test_deep_nesting(self):
+        depth = 10000
+        handler = SAXHandlerBasic()
+        SAXParser(io.StringIO("[" * depth + "]" * depth), handler).run()
+        result = handler.result
+        for _i in range(depth - 1):
+            self.assertEqual(1, len(result), "Nesting 1.1")
+            result = result[0]
+        self.assertListEqual([], result, "Nesting 1.1")
+        handler = SAXHandlerBasic()
+        SAXParser(io.StringIO("{\"a\": " * depth + "null" + "}" * depth), handler).run()
+        result = handler.result
+        for _i in range(depth):
+            self.assertListEqual(["a"], list(result.keys()), "Nesting 1.2")
+            result = result["a"]
+        self.assertIsNone(result, "Nesting 1.2")
+
+    def test_handler_not_derived(self):
+        class CountHandler:
+            def __init__(self) -> None:
+                self.count = 0
+            def _count(self, *args):
+                self.count += 1
+            on_literal = on_number = on_string = on_member_name = _count
+            on_begin_object = on_end_object = on_begin_array = on_end_array = _count
+            def textpos_changed(self, pos: TextPos):
+                pass
+        handler = CountHandler()
+        SAXParser("[1, {\"a\": true}]", handler).run()
+        self.assertEqual(7, handler.count, "Handler 1.1")
+
 
 if __name__ == "__main__":
     unittest.main()